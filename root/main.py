@@ -8,17 +8,33 @@ load_dotenv()
 from parsers import WorkUaParser, RobotaUaParser
 from telegram_bot import TelegramBot
 
-nltk.download("punkt")
-nltk.download("punkt_tab")
-nltk.download("stopwords")
-
-work_ua_parser = WorkUaParser()
-robota_ua_parser = RobotaUaParser()
+NLTK_RESOURCES = {
+    "punkt": "tokenizers/punkt",
+    "punkt_tab": "tokenizers/punkt_tab",
+    "stopwords": "corpora/stopwords",
+}
 
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 LOG_LEVEL = logging.INFO
 logging.basicConfig(format=LOG_FORMAT, level=LOG_LEVEL)
 
+
+def ensure_nltk_resource(package: str, resource_path: str) -> None:
+    """
+    Downloads an NLTK package only if its resource isn't installed yet.
+    """
+    try:
+        nltk.data.find(resource_path)
+    except LookupError:
+        nltk.download(package, quiet=True)
+
+
 if __name__ == "__main__":
+    for package, resource_path in NLTK_RESOURCES.items():
+        ensure_nltk_resource(package, resource_path)
+
+    work_ua_parser = WorkUaParser()
+    robota_ua_parser = RobotaUaParser()
+
     bot = TelegramBot(work_ua_parser, robota_ua_parser)
     bot.run()
@@ -1,8 +1,13 @@
 import os
-import json
+import math
 import logging
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import schemas
 import utils
@@ -10,6 +15,46 @@ import utils
 
 logger = logging.getLogger(__name__)
 
+RESUMES_PAGE_SIZE = 500
+
+
+def _load_regions() -> MappingProxyType | None:
+    """
+    Loads the region data from a JSON file. Returns None if the file is missing or invalid.
+    """
+    region_file_path = os.getenv("ROBOTA_UA_REGIONS_JSON_PATH")
+
+    try:
+        return utils.load_json_config(region_file_path)
+    except (FileNotFoundError, orjson.JSONDecodeError) as error:
+        logger.info(f"Failed to load regions from file: {error}. Fetching from URL...")
+        return None
+
+
+def _save_regions(region_data: dict) -> None:
+    """
+    Saves the fetched region data to the JSON file for future use.
+    """
+    region_file_path = os.getenv("ROBOTA_UA_REGIONS_JSON_PATH")
+
+    with open(region_file_path, "wb") as region_file:
+        region_file.write(orjson.dumps(region_data, option=orjson.OPT_INDENT_2))
+        logger.info(f"Regions fetched and saved to {region_file_path}.")
+
+
+def _load_experience_options() -> MappingProxyType:
+    """
+    Loads the experience options data from a JSON file. If the file doesn't exist or is invalid,
+    the function logs the error and returns no options.
+    """
+    experience_file_path = os.getenv("ROBOTA_UA_EXPERIENCE_JSON_PATH")
+
+    try:
+        return utils.load_json_config(experience_file_path)
+    except (FileNotFoundError, orjson.JSONDecodeError) as error:
+        logger.info(f"Failed to load experience options from file: {error}.")
+        return MappingProxyType({})
+
 
 class RobotaUaParser:
     """
@@ -20,65 +65,49 @@ class RobotaUaParser:
 
     def __init__(self):
         """
-        Initializes the RobotaUaParser by logging in, setting headers, and loading regions and experience options.
+        Initializes the RobotaUaParser by logging in, creating an authenticated session,
+        and loading regions and experience options.
         """
-        self.__login()
-        self.__set_headers()
-        self.__load_regions()
-        self.__load_experience_options()
+        self.REGIONS = _load_regions()
+        self.__create_session()
+        self.__login_and_load_regions()
+        self.__region_keys = tuple(self.REGIONS.keys())
+        self.EXPERIENCE_OPTIONS = _load_experience_options()
 
-    def __load_regions(self) -> None:
+    def __login_and_load_regions(self) -> None:
         """
-        Loads the region data either from a JSON file or from a remote URL if the file is unavailable.
-        If fetched from the URL, the data is saved to the JSON file for future use.
+        Logs in and, if the regions file was unavailable, fetches the regions in parallel threads,
+        so a cold regions cache doesn't add a second round trip to the startup.
         """
-        region_file_path = os.getenv("ROBOTA_UA_REGIONS_JSON_PATH")
+        if self.REGIONS is not None:
+            self.__login()
+            return
 
-        try:
-            with open(region_file_path, "r") as region_file:
-                region_data = json.load(region_file)
-                self.REGIONS = region_data
-                return
-        except (FileNotFoundError, json.JSONDecodeError) as error:
-            logger.info(
-                f"Failed to load regions from file: {error}. Fetching from URL..."
-            )
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            login_future = executor.submit(self.__login)
+            regions_future = executor.submit(self.__fetch_regions)
+            login_future.result()
+            regions_future.result()
 
+    def __fetch_regions(self) -> None:
+        """
+        Fetches the region data from a remote URL and saves it to the JSON file for future use.
+        """
         regions_url = os.getenv("ROBOTA_UA_REGIONS_URL")
-        response = requests.get(regions_url)
+        response = self.__session.get(regions_url)
 
         if response.status_code != 200:
             raise Exception("Failed to fetch regions from Robota.ua")
 
-        fetched_data = response.json()
+        fetched_data = orjson.loads(response.content)
         region_data = {city["en"]: city["id"] for city in fetched_data}
 
-        with open(region_file_path, "w") as region_file:
-            json.dump(region_data, region_file, indent=4)
-            logger.info(f"Regions fetched and saved to {region_file_path}.")
-
-        self.REGIONS = region_data
-        return
-
-    def __load_experience_options(self) -> None:
-        """
-        Loads the experience options data from a JSON file. If the file doesn't exist or is invalid,
-        the method logs the error and does nothing.
-        """
-        experience_file_path = os.getenv("ROBOTA_UA_EXPERIENCE_JSON_PATH")
-
-        try:
-            with open(experience_file_path, "r") as experience_file:
-                experience_data = json.load(experience_file)
-                self.EXPERIENCE_OPTIONS = experience_data
-                return
-        except (FileNotFoundError, json.JSONDecodeError) as error:
-            logger.info(f"Failed to load experience options from file: {error}.")
-            return
+        _save_regions(region_data)
+        self.REGIONS = MappingProxyType(region_data)
 
     def __login(self) -> None:
         """
-        Logs in to the Robota.ua website and retrieves a token for authentication.
+        Logs in to the Robota.ua website and authorizes the session with the retrieved token.
         """
         login_url = os.getenv("ROBOTA_UA_LOGIN_URL")
 
@@ -87,23 +116,37 @@ class RobotaUaParser:
 
         login_payload = {"username": user_name, "password": pass_word}
 
-        response = requests.post(login_url, json=login_payload)
+        response = self.__session.post(login_url, json=login_payload)
 
         if response.status_code == 200:
-            self.__token = response.json()
+            token = orjson.loads(response.content)
+            self.__session.headers["Authorization"] = f"Bearer {token}"
         else:
             raise Exception("Failed to login to Robota.ua")
 
-    def __set_headers(self) -> None:
+    def __create_session(self) -> None:
         """
-        Sets the HTTP headers required for making authenticated requests.
+        Creates a pooled HTTP session with the headers required for making requests,
+        so connections to Robota.ua are reused across searches.
         """
-        request_headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.__token}",
-        }
+        session = requests.Session()
+        session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=20,
+                pool_maxsize=50,
+                max_retries=Retry(total=3, backoff_factor=0.3),
+            ),
+        )
+        session.headers.update({"Content-Type": "application/json"})
 
-        self.__headers = request_headers
+        self.__session = session
+
+    def close(self) -> None:
+        """
+        Closes the pooled HTTP session.
+        """
+        self.__session.close()
 
     @staticmethod
     def format_salary_expectation(salary_str: str) -> str:
@@ -140,10 +183,16 @@ class RobotaUaParser:
         Prepares the search payload based on the user's search options.
         """
         region_name = utils.get_most_similar_word(
-            search_params.region, self.REGIONS.keys()
+            search_params.region, self.__region_keys
         )
         region_id = self.REGIONS[region_name] if region_name else None
 
+        experience_ids = []
+        for exp in search_params.experience:
+            experience_id = self.EXPERIENCE_OPTIONS.get(exp)
+            if experience_id:
+                experience_ids.append(experience_id)
+
         search_payload = {
             "cityId": region_id,
             "keyWords": search_params.search,
@@ -151,11 +200,7 @@ class RobotaUaParser:
                 "from": search_params.salary_from,
                 "to": search_params.salary_to,
             },
-            "experienceIds": [
-                self.EXPERIENCE_OPTIONS.get(exp)
-                for exp in search_params.experience
-                if self.EXPERIENCE_OPTIONS.get(exp)
-            ],
+            "experienceIds": experience_ids,
         }
 
         if "More than 5 years" in search_params.experience:
@@ -168,41 +213,46 @@ class RobotaUaParser:
 
         return search_payload
 
+    def __post_resumes(self, resumes_url: str, search_payload: dict) -> dict:
+        """
+        Posts a resume search request to Robota.ua and returns the response data.
+        """
+        response = self.__session.post(resumes_url, json=search_payload)
+
+        if response.status_code != 200:
+            logger.info(
+                f"Request failed with status code {response.status_code}: {response.text}"
+            )
+            response.raise_for_status()
+
+        return orjson.loads(response.content)
+
     def search_resumes(
         self, search_params: schemas.SearchOptions = None
     ) -> list[schemas.Resume]:
         """
         Searches for resumes on Robota.ua based on the provided search options.
+        Resumes are requested in large pages, so most searches take a single request.
         """
         resumes_url = os.getenv("ROBOTA_UA_RESUMES_URL")
 
-        request_headers = self.__headers
         search_payload = self.__unpack_search_options(search_params)
+        search_payload["count"] = RESUMES_PAGE_SIZE
 
-        response = requests.post(
-            resumes_url, json=search_payload, headers=request_headers
-        )
+        response_data = self.__post_resumes(resumes_url, search_payload)
+        documents = response_data["documents"]
 
-        total_resumes = response.json()["total"]
+        total_resumes = response_data["total"]
         logger.info(f"Found {total_resumes} resumes on Robota.ua")
 
-        search_payload["count"] = total_resumes
-        response = requests.post(
-            resumes_url, json=search_payload, headers=request_headers
-        )
+        for page in range(1, math.ceil(total_resumes / RESUMES_PAGE_SIZE)):
+            search_payload["page"] = page
+            response_data = self.__post_resumes(resumes_url, search_payload)
+            documents.extend(response_data["documents"])
 
         resumes_list = []
-        if response.status_code == 200:
-            response_data = response.json()
-
-            for resume in response_data["documents"]:
-                resume_info = RobotaUaParser.unpack_resume_from_response(resume)
-                resumes_list.append(schemas.Resume(**resume_info))
+        for resume in documents:
+            resume_info = RobotaUaParser.unpack_resume_from_response(resume)
+            resumes_list.append(schemas.Resume(**resume_info))
 
-            return resumes_list
-
-        else:
-            logger.info(
-                f"Request failed with status code {response.status_code}: {response.text}"
-            )
-            response.raise_for_status()
+        return resumes_list
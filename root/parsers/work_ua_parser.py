@@ -1,110 +1,156 @@
 import os
 import re
 import math
-import json
+import asyncio
 import logging
-
+import functools
+import multiprocessing
+from types import MappingProxyType
+from typing import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+import orjson
 import requests
+import soupsieve
 from urllib.parse import urlencode
 from bs4 import BeautifulSoup
+from lxml import etree
 
 import schemas
 import utils
 
 logger = logging.getLogger(__name__)
 
+MAX_CONCURRENT_REQUESTS = 20
+HTML_CACHE_TTL = 24 * 3600
+HTML_CACHE_MAX_ENTRIES = 10000
+HTML_CACHE_DIR = "cache/work_ua/html"
 
-class WorkUaParser:
+NBSP_TRANSLATION = str.maketrans({"\xa0": " "})
+
+CITIES_TH_REGEX = re.compile(r"citiesTH\s*=\s*\[(.*?)];", re.DOTALL)
+JS_OBJECT_KEY_REGEX = re.compile(r"(\w+):")
+CANDIDATES_COUNT_REGEX = re.compile(r"(\d+)\s+(candidate|candidates)", re.IGNORECASE)
+
+HTML_FEED_CHUNK_SIZE = 64 * 1024
+
+DESCRIPTION_META_SELECTOR = soupsieve.compile('meta[name="Description"]')
+HEADER_SELECTOR = soupsieve.compile("h2")
+DURATION_SELECTOR = soupsieve.compile("span.text-default-7")
+
+
+@functools.lru_cache(maxsize=1)
+def _load_regions() -> MappingProxyType:
     """
-    A parser for interacting with the Work.ua website to search resumes and handle related data.
+    Loads the region data from a JavaScript URL or JSON file.
     """
+    json_file_path = os.getenv("WORK_UA_REGIONS_JSON_PATH")
+    try:
+        return utils.load_json_config(json_file_path)
+    except (FileNotFoundError, orjson.JSONDecodeError) as e:
+        logger.info(f"Failed to load regions from file: {e}. Fetching from JS URL...")
 
-    base_url = os.getenv("WORK_UA_URL")
+    js_url = os.getenv("WORK_UA_MIN_JS_URL")
+    response = requests.get(js_url)
+    if response.status_code != 200:
+        raise Exception(f"Failed to fetch JavaScript content: {response.status_code}")
 
-    def __init__(self):
-        """
-        Initializes the Work.ua parser with the base URL for resumes.
-        """
-        self.REGIONS = self.__load_regions()
-        self.SALARY_FROM_OPTIONS, self.SALARY_TO_OPTIONS = self.__load_salary_options()
-        self.EXPERIENCE_OPTIONS = self.__load_experience_options()
+    return MappingProxyType(_extract_regions(response.text))
 
-    def __load_regions(self):
-        """
-        Loads the region data from a JavaScript URL or JSON file.
-        """
-        json_file_path = os.getenv("WORK_UA_REGIONS_JSON_PATH")
+
+def _extract_regions(js_content):
+    """
+    Extracts region data from JavaScript content.
+    """
+    match = CITIES_TH_REGEX.search(js_content)
+
+    if match:
+        cities_th_raw = match.group(1)
+        cities_th_json = JS_OBJECT_KEY_REGEX.sub(r'"\1":', cities_th_raw)
         try:
-            with open(json_file_path, "r") as json_file:
-                return json.load(json_file)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            logger.info(
-                f"Failed to load regions from file: {e}. Fetching from JS URL..."
-            )
+            cities_th_list = orjson.loads(f"[{cities_th_json}]")
+            regions = {city["en"]: city["id"] for city in cities_th_list}
+            return regions
+        except orjson.JSONDecodeError as e:
+            raise Exception(f"Error decoding JSON: {e}")
+    else:
+        raise Exception("citiesTH list not found in the JavaScript content.")
 
-        js_url = os.getenv("WORK_UA_MIN_JS_URL")
-        response = requests.get(js_url)
-        if response.status_code != 200:
-            raise Exception(
-                f"Failed to fetch JavaScript content: {response.status_code}"
-            )
 
-        return self.__extract_regions(response.text)
+def _load_salary_options() -> tuple[MappingProxyType, MappingProxyType]:
+    """
+    Loads salary data from a JSON file.
+    """
+    salary_json_path = os.getenv("WORK_UA_SALARY_JSON_PATH")
+    try:
+        salary_data = utils.load_json_config(salary_json_path)
+        return (
+            MappingProxyType(salary_data.get("from", {})),
+            MappingProxyType(salary_data.get("to", {})),
+        )
+    except (FileNotFoundError, orjson.JSONDecodeError) as e:
+        logger.info(f"Failed to load salary options from file: {e}.")
+        return MappingProxyType({}), MappingProxyType({})
 
-    def __extract_regions(self, js_content):
-        """
-        Extracts region data from JavaScript content.
-        """
-        pattern = r"citiesTH\s*=\s*\[(.*?)];"
-        match = re.search(pattern, js_content, re.DOTALL)
 
-        if match:
-            cities_th_raw = match.group(1)
-            cities_th_json = re.sub(r"(\w+):", r'"\1":', cities_th_raw)
-            try:
-                cities_th_list = json.loads(f"[{cities_th_json}]")
-                regions = {city["en"]: city["id"] for city in cities_th_list}
-                return regions
-            except json.JSONDecodeError as e:
-                raise Exception(f"Error decoding JSON: {e}")
-        else:
-            raise Exception("citiesTH list not found in the JavaScript content.")
+def _load_experience_options() -> MappingProxyType:
+    """
+    Loads experience data from a JSON file.
+    """
+    experience_json_path = os.getenv("WORK_UA_EXPERIENCE_JSON_PATH")
+    try:
+        return utils.load_json_config(experience_json_path)
+    except (FileNotFoundError, orjson.JSONDecodeError) as e:
+        logger.info(f"Failed to load experience options from file: {e}.")
+        return MappingProxyType({})
 
-    def __load_salary_options(self):
-        """
-        Loads salary data from a JSON file.
-        """
-        salary_json_path = os.getenv("WORK_UA_SALARY_JSON_PATH")
-        try:
-            with open(salary_json_path, "r") as json_file:
-                salary_data = json.load(json_file)
-                return salary_data.get("from", {}), salary_data.get("to", {})
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            logger.info(f"Failed to load salary options from file: {e}.")
-            return {}, {}
-
-    def __load_experience_options(self):
+
+class WorkUaParser:
+    """
+    A parser for interacting with the Work.ua website to search resumes and handle related data.
+    """
+
+    base_url = os.getenv("WORK_UA_URL")
+
+    def __init__(self):
         """
-        Loads experience data from a JSON file.
+        Initializes the Work.ua parser with the base URL for resumes.
         """
-        experience_json_path = os.getenv("WORK_UA_EXPERIENCE_JSON_PATH")
-        try:
-            with open(experience_json_path, "r") as json_file:
-                return json.load(json_file)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            logger.info(f"Failed to load experience options from file: {e}.")
-            return {}
+        self.REGIONS = _load_regions()
+        self.__region_keys = tuple(self.REGIONS.keys())
+        self.SALARY_FROM_OPTIONS, self.SALARY_TO_OPTIONS = _load_salary_options()
+        self.EXPERIENCE_OPTIONS = _load_experience_options()
+        self.__semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # Forking the already multi-threaded bot process could deadlock the workers,
+        # spawn is safe and available on every platform
+        self.__process_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self.__client = httpx.AsyncClient(
+            timeout=60,
+            follow_redirects=True,
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONCURRENT_REQUESTS,
+                    max_keepalive_connections=MAX_CONCURRENT_REQUESTS,
+                ),
+            ),
+        )
 
     @staticmethod
     def get_total_candidates(html: str) -> int:
         """
         Parses the HTML content to extract the total number of candidates.
+        The raw HTML is searched first, the page is only parsed if the count is split by markup.
         """
-        soup = BeautifulSoup(html, "html.parser")
-        text_content = soup.get_text()
-        match = re.search(
-            r"(\d+)\s+(candidate|candidates)", text_content, re.IGNORECASE
-        )
+        match = CANDIDATES_COUNT_REGEX.search(html)
+        if not match:
+            text_content = BeautifulSoup(html, "lxml").get_text()
+            match = CANDIDATES_COUNT_REGEX.search(text_content)
         if match:
             return int(match.group(1))
         else:
@@ -122,7 +168,7 @@ class WorkUaParser:
         """
         Formats the experience detail by removing unnecessary characters.
         """
-        return experience.strip().replace("\xa0", " ")
+        return experience.translate(NBSP_TRANSLATION).strip()
 
     def __unpack_search_options(self, params: schemas.SearchOptions) -> dict:
         """
@@ -133,7 +179,7 @@ class WorkUaParser:
         }
 
         if params.region:
-            region = utils.get_most_similar_word(params.region, self.REGIONS.keys())
+            region = utils.get_most_similar_word(params.region, self.__region_keys)
             payload["region"] = self.REGIONS.get(region)
         if params.salary_from:
             payload["salaryfrom"] = self.SALARY_FROM_OPTIONS.get(
@@ -142,85 +188,125 @@ class WorkUaParser:
         if params.salary_to:
             payload["salaryto"] = self.SALARY_TO_OPTIONS.get(str(params.salary_to))
         if params.experience:
-            payload["experience"] = "+".join(
-                self.EXPERIENCE_OPTIONS.get(exp, "") for exp in params.experience
-            )
+            experience_ids = [
+                self.EXPERIENCE_OPTIONS[exp]
+                for exp in params.experience
+                if exp in self.EXPERIENCE_OPTIONS
+            ]
+            # urlencode turns the spaces into the "+" separators Work.ua expects
+            payload["experience"] = " ".join(experience_ids)
 
         return payload
 
-    def get_resume_pages(self, params: schemas.SearchOptions) -> list[str]:
+    async def close(self) -> None:
+        """
+        Closes the HTTP client and shuts down the resume parsing processes.
+        """
+        await self.__client.aclose()
+        self.__process_pool.shutdown(cancel_futures=True)
+
+    @utils.disk_memoize(
+        os.getenv("WORK_UA_HTML_CACHE_DIR", HTML_CACHE_DIR),
+        ttl=HTML_CACHE_TTL,
+        max_entries=HTML_CACHE_MAX_ENTRIES,
+    )
+    async def __fetch_html(self, url: str) -> str:
+        """
+        Fetches the HTML content of a Work.ua page through ScraperAPI,
+        limiting the number of requests in flight. Pages are cached by URL.
+        """
+        scraper_api_url = utils.wrap_with_scraper_api(url)
+
+        async with self.__semaphore:
+            response = await self.__client.get(scraper_api_url)
+        response.raise_for_status()
+        return response.text
+
+    async def iter_resume_pages(
+        self, params: schemas.SearchOptions
+    ) -> AsyncIterator[str]:
         """
         Fetches HTML content of the Work.ua resume section, formatted with pagination and search parameters.
+        The first page is used to count the pages, the remaining ones are fetched concurrently
+        and yielded as soon as each of them arrives.
         """
         payload = self.__unpack_search_options(params)
-        page = 1
-        payload["page"] = page
+        payload["page"] = 1
         url = WorkUaParser.build_resumes_url(payload)
-        scraper_api_url = utils.wrap_with_scraper_api(url)
 
-        html_pages = []
         try:
-            response = requests.get(scraper_api_url, timeout=60)
-            response.raise_for_status()
-            html_pages.append(response.text)
-
-            total_candidates = WorkUaParser.get_total_candidates(response.text)
-            total_pages = math.ceil(total_candidates / 14)
-            logger.info(
-                f"Total candidates: {total_candidates}, Total pages: {total_pages} on Work.ua"
+            first_page = await self.__fetch_html(url)
+        except httpx.HTTPError as e:
+            logger.info(f"Error fetching URL {url} on page 1: {e}")
+            raise
+
+        total_candidates = WorkUaParser.get_total_candidates(first_page)
+        total_pages = math.ceil(total_candidates / 14)
+        logger.info(
+            f"Total candidates: {total_candidates}, Total pages: {total_pages} on Work.ua"
+        )
+
+        yield first_page
+
+        page_fetches = [
+            asyncio.create_task(
+                self.__fetch_html(
+                    WorkUaParser.build_resumes_url({**payload, "page": page})
+                )
             )
+            for page in range(2, total_pages + 1)
+        ]
 
-            for page in range(2, total_pages + 1, 2):
-                payload["page"] = page
-                url = self.build_resumes_url(payload)
-                scraper_api_url = utils.wrap_with_scraper_api(url)
-                response = requests.get(scraper_api_url, timeout=60)
-                response.raise_for_status()
-                html_pages.append(response.text)
-
-            for page in range(3, total_pages + 1, 2):
-                payload["page"] = page
-                url = self.build_resumes_url(payload)
-                scraper_api_url = utils.wrap_with_scraper_api(url)
-                response = requests.get(scraper_api_url, timeout=60)
-                response.raise_for_status()
-                html_pages.append(response.text)
-
-        except requests.RequestException as e:
-            logger.info(f"Error fetching URL {url} on page {page}: {e}")
+        try:
+            for page_fetch in asyncio.as_completed(page_fetches):
+                yield await page_fetch
+        except httpx.HTTPError as e:
+            logger.info(f"Error fetching resume pages on Work.ua: {e}")
             raise
-
-        return html_pages
+        finally:
+            # Stop the remaining fetches when a page fails or the caller stops iterating
+            for page_fetch in page_fetches:
+                page_fetch.cancel()
 
     @staticmethod
     def get_resume_href_from_html(html: str) -> list[str]:
         """
         Parses the HTML content and extracts relevant data from the Work.ua resume section.
+        The page is parsed as a stream, every resume card is dropped as soon as its link is read.
         """
-        soup = BeautifulSoup(html, "html.parser")
-        divs = soup.find_all(
-            "div",
-            class_=lambda class_name: class_name
-            and "card" in class_name
-            and "resume-link" in class_name,
-        )
-        return [
-            div.find("a", href=True)["href"] for div in divs if div.find("a", href=True)
-        ]
-
-    @staticmethod
-    def get_resume_html_from_href(href: str) -> str | None:
+        parser = etree.HTMLPullParser(events=("end",), tag="div")
+        hrefs = []
+
+        def read_resume_hrefs() -> None:
+            for _, div in parser.read_events():
+                class_name = div.get("class", "")
+                if "card" in class_name and "resume-link" in class_name:
+                    link = div.find(".//a[@href]")
+                    if link is not None:
+                        hrefs.append(link.get("href"))
+                    div.clear()
+                    while div.getprevious() is not None:
+                        del div.getparent()[0]
+
+        for start in range(0, len(html), HTML_FEED_CHUNK_SIZE):
+            parser.feed(html[start : start + HTML_FEED_CHUNK_SIZE])
+            read_resume_hrefs()
+
+        if html:
+            parser.close()
+            read_resume_hrefs()
+
+        return hrefs
+
+    async def get_resume_html_from_href(self, href: str) -> str | None:
         """
         Fetches the HTML content of a resume page from Work.ua using the provided URL.
         """
         url = f"{WorkUaParser.base_url}{href}"
-        scraper_api_url = utils.wrap_with_scraper_api(url)
 
         try:
-            response = requests.get(scraper_api_url, timeout=60)
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
+            return await self.__fetch_html(url)
+        except httpx.HTTPError as e:
             logger.info(f"Error fetching URL {url}: {e}")
             return None
 
@@ -228,12 +314,13 @@ class WorkUaParser:
     def parse_resume(link, html: str) -> dict:
         """
         Parses the HTML content of a resume page and extracts relevant details.
+        Runs in a worker process, so it returns a plain dictionary rather than a schemas.Resume.
         """
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml")
         resume = {"salary_expectation": "", "experience": [], "filling_percentage": 0}
 
         # Extract salary expectation
-        description_meta = soup.find("meta", attrs={"name": "Description"})
+        description_meta = DESCRIPTION_META_SELECTOR.select_one(soup)
         if description_meta:
             description_content = description_meta.get("content", "")
             if "salary starting at" in description_content:
@@ -242,25 +329,38 @@ class WorkUaParser:
                 resume["salary expectation"] = salary
 
         # Extract work experience
-        work_experience_header = soup.find("h2", string="Work experience")
-        if work_experience_header:
-            experience_section = work_experience_header.find_next_siblings(
-                "h2", class_="h4"
-            )
+        headers = HEADER_SELECTOR.select(soup)
+        header_index = next(
+            (
+                index
+                for index, header in enumerate(headers)
+                if header.string == "Work experience"
+            ),
+            None,
+        )
+        if header_index is not None:
+            work_experience_header = headers[header_index]
+            experience_section = [
+                header
+                for header in headers[header_index + 1 :]
+                if header.parent is work_experience_header.parent
+                and "h4" in header.get("class", [])
+            ]
             for position_tag in experience_section:
                 position = position_tag.text.strip()
                 details_tag = position_tag.find_next_sibling("p", class_="mb-0")
                 if details_tag:
-                    duration_tag = details_tag.find("span", class_="text-default-7")
+                    duration_tag = DURATION_SELECTOR.select_one(details_tag)
                     duration = (
                         WorkUaParser.format_experience_detail(duration_tag.text)
                         if duration_tag
                         else None
                     )
-                    details_text = details_tag.get_text(separator=" ", strip=True)
                     details = WorkUaParser.format_experience_detail(
-                        details_text.replace(duration or "", "")
+                        details_tag.get_text(separator=" ", strip=True)
                     )
+                    if duration:
+                        details = details.replace(duration, "", 1).strip()
                     experience = {
                         "position": position,
                         "duration": duration,
@@ -270,21 +370,54 @@ class WorkUaParser:
 
         link = WorkUaParser.base_url + link
         resume["href"] = link
-        return schemas.Resume(**resume)
+        return resume
 
-    def search_resumes(self, params: schemas.SearchOptions) -> list[dict]:
+    async def search_resumes(
+        self, params: schemas.SearchOptions
+    ) -> list[schemas.Resume]:
         """
         Searches resumes on Work.ua by extracting data and formatting it into structured information.
+        Resume links are queued as soon as their listing page arrives, and a pool of consumers
+        fetches the resumes while the remaining listing pages are still loading. Parsing is spread
+        across worker processes. If any page fails, all outstanding fetches are cancelled.
         """
-        html_pages = self.get_resume_pages(params)
+        loop = asyncio.get_running_loop()
+        resume_links = asyncio.Queue()
         resume_data = []
-        for html_page in html_pages:
-            resume_links = self.get_resume_href_from_html(html_page)
-            for link in resume_links:
-                resume_html = self.get_resume_html_from_href(link)
+
+        async def produce_links() -> None:
+            seen_links = set()
+            try:
+                async for html_page in self.iter_resume_pages(params):
+                    for link in self.get_resume_href_from_html(html_page):
+                        if link not in seen_links:
+                            seen_links.add(link)
+                            await resume_links.put(link)
+            finally:
+                for _ in range(MAX_CONCURRENT_REQUESTS):
+                    resume_links.put_nowait(None)
+
+        async def consume_links() -> None:
+            while (link := await resume_links.get()) is not None:
+                resume_html = await self.get_resume_html_from_href(link)
                 if resume_html:
                     logger.info(f"Processing: {WorkUaParser.base_url + link}")
-                    resume_data.append(
-                        self.parse_resume(WorkUaParser.base_url + link, resume_html)
+                    resume_info = await loop.run_in_executor(
+                        self.__process_pool,
+                        WorkUaParser.parse_resume,
+                        link,
+                        resume_html,
                     )
+                    resume_data.append(schemas.Resume(**resume_info))
+
+        # A failing task cancels the others, so no requests outlive the search
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                task_group.create_task(produce_links())
+                for _ in range(MAX_CONCURRENT_REQUESTS):
+                    task_group.create_task(consume_links())
+        except Exception as e:
+            # TaskGroup wraps the failures in an ExceptionGroup, callers get the first one as is
+            raise e.exceptions[0] from e
+
         return resume_data
@@ -1,25 +1,29 @@
 from enum import Enum
 from typing import Optional
-from pydantic import BaseModel
+from dataclasses import dataclass, field
+from pydantic import BaseModel, ConfigDict
 
 
 class Experience(BaseModel):
-    position: Optional[str]
-    duration: Optional[str]
-    details: Optional[str]
+    model_config = ConfigDict(frozen=True)
+
+    position: Optional[str] = None
+    duration: Optional[str] = None
+    details: Optional[str] = None
 
 
 class Resume(BaseModel):
-    href: str
-    salary_expectation: Optional[str]
-    experience: Optional[list[Experience]]
-    filling_percentage: int
+    model_config = ConfigDict(frozen=True)
 
-    def __lt__(self, other):
-        return self.filling_percentage < other.filling_percentage
+    href: str
+    salary_expectation: Optional[str] = None
+    experience: Optional[list[Experience]] = None
+    filling_percentage: int = 0
 
 
 class SearchOptions(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     search: str
     region: Optional[str]
     salary_from: Optional[int]
@@ -35,3 +39,22 @@ class UserState(str, Enum):
     ASKING_SALARY_FROM = "asking_salary_from"
     ASKING_SALARY_TO = "asking_salary_to"
     FREE = "free"
+
+
+@dataclass(slots=True)
+class UserSession:
+    state: UserState = UserState.FREE
+    search: str = ""
+    region: str = ""
+    salary_from: int = 0
+    salary_to: int = 0
+    experience: list[str] = field(default_factory=list)
+
+    def to_search_options(self) -> SearchOptions:
+        return SearchOptions(
+            search=self.search,
+            region=self.region,
+            salary_from=self.salary_from,
+            salary_to=self.salary_to,
+            experience=self.experience,
+        )
@@ -1,8 +1,9 @@
-from .Info import Resume, Experience, UserState, SearchOptions
+from .Info import Resume, Experience, UserState, SearchOptions, UserSession
 
 __all__ = [
     "Resume",
     "Experience",
     "UserState",
     "SearchOptions",
+    "UserSession",
 ]
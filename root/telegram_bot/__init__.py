@@ -1,4 +1,14 @@
 from .telegram_bot import TelegramBot
+from .session_store import (
+    InMemorySessionStore,
+    RedisSessionStore,
+    create_session_store,
+)
 
 
-__all__ = ["TelegramBot"]
+__all__ = [
+    "TelegramBot",
+    "InMemorySessionStore",
+    "RedisSessionStore",
+    "create_session_store",
+]
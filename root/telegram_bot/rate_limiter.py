@@ -0,0 +1,71 @@
+import contextlib
+from typing import Any, Optional
+
+from aiolimiter import AsyncLimiter
+from telegram.ext import AIORateLimiter
+
+
+MAX_CHAT_LIMITERS = 512
+
+
+class ChatRateLimiter(AIORateLimiter):
+    """
+    Extends AIORateLimiter, which only limits the overall and per-group traffic,
+    with a limit for each private chat (by default 1 message per second).
+    """
+
+    def __init__(
+        self,
+        chat_max_rate: float = 1,
+        chat_time_period: float = 1,
+        **kwargs: Any,
+    ):
+        super().__init__(**kwargs)
+        self.__chat_max_rate = chat_max_rate
+        self.__chat_time_period = chat_time_period
+        self.__chat_limiters = {}
+
+    def __get_chat_limiter(self, chat_id: int) -> AsyncLimiter:
+        """
+        Returns the limiter of the given chat, dropping idle limiters once there are too many.
+        """
+        if len(self.__chat_limiters) > MAX_CHAT_LIMITERS:
+            for key, limiter in list(self.__chat_limiters.items()):
+                if key != chat_id and limiter.has_capacity(limiter.max_rate):
+                    del self.__chat_limiters[key]
+
+        limiter = self.__chat_limiters.get(chat_id)
+        if limiter is None:
+            limiter = AsyncLimiter(self.__chat_max_rate, self.__chat_time_period)
+            self.__chat_limiters[chat_id] = limiter
+
+        return limiter
+
+    async def process_request(
+        self,
+        callback,
+        args: Any,
+        kwargs: dict[str, Any],
+        endpoint: str,
+        data: dict[str, Any],
+        rate_limit_args: Optional[int],
+    ):
+        """
+        Waits for the private chat limit, if the request targets a private chat,
+        and then applies the overall and group limits of AIORateLimiter.
+        """
+        chat_id = data.get("chat_id")
+        with contextlib.suppress(ValueError, TypeError):
+            chat_id = int(chat_id)
+
+        # Group and channel ids are negative, AIORateLimiter already limits them
+        chat_limiter = (
+            self.__get_chat_limiter(chat_id)
+            if isinstance(chat_id, int) and chat_id > 0
+            else contextlib.nullcontext()
+        )
+
+        async with chat_limiter:
+            return await super().process_request(
+                callback, args, kwargs, endpoint, data, rate_limit_args
+            )
@@ -0,0 +1,106 @@
+import os
+import logging
+from typing import Optional
+
+import orjson
+import redis.asyncio as redis
+
+import schemas
+
+
+logger = logging.getLogger(__name__)
+
+SESSION_KEY_PREFIX = "telegram_session:"
+
+
+class InMemorySessionStore:
+    """
+    Keeps user sessions in the memory of the current process.
+    """
+
+    def __init__(self):
+        self.__sessions = {}
+
+    async def get(self, chat_id: int) -> Optional[schemas.UserSession]:
+        """
+        Returns the session of the given chat, or None if there is none.
+        """
+        return self.__sessions.get(chat_id)
+
+    async def save(self, chat_id: int, session: schemas.UserSession) -> None:
+        """
+        Stores the session of the given chat.
+        """
+        self.__sessions[chat_id] = session
+
+    async def delete(self, chat_id: int) -> None:
+        """
+        Removes the session of the given chat.
+        """
+        self.__sessions.pop(chat_id, None)
+
+    async def close(self) -> None:
+        """
+        Nothing to release for sessions kept in memory.
+        """
+        pass
+
+
+class RedisSessionStore:
+    """
+    Keeps user sessions in Redis so they are shared between bot processes and survive restarts.
+    Every read and save refreshes the session TTL.
+    """
+
+    def __init__(self, redis_url: str, ttl: int):
+        self.__redis = redis.from_url(redis_url)
+        self.__ttl = ttl
+
+    async def get(self, chat_id: int) -> Optional[schemas.UserSession]:
+        """
+        Returns the session of the given chat and refreshes its TTL, or None if there is none.
+        """
+        raw_session = await self.__redis.getex(
+            f"{SESSION_KEY_PREFIX}{chat_id}", ex=self.__ttl
+        )
+        if raw_session is None:
+            return None
+
+        session_data = orjson.loads(raw_session)
+        session_data["state"] = schemas.UserState(session_data["state"])
+        return schemas.UserSession(**session_data)
+
+    async def save(self, chat_id: int, session: schemas.UserSession) -> None:
+        """
+        Stores the session of the given chat and refreshes its TTL.
+        """
+        await self.__redis.set(
+            f"{SESSION_KEY_PREFIX}{chat_id}",
+            orjson.dumps(session),
+            ex=self.__ttl,
+        )
+
+    async def delete(self, chat_id: int) -> None:
+        """
+        Removes the session of the given chat.
+        """
+        await self.__redis.delete(f"{SESSION_KEY_PREFIX}{chat_id}")
+
+    async def close(self) -> None:
+        """
+        Closes the connections to Redis.
+        """
+        await self.__redis.aclose()
+
+
+def create_session_store():
+    """
+    Creates a Redis session store when TELEGRAM_SESSION_REDIS_URL is set,
+    otherwise falls back to keeping sessions in memory.
+    """
+    redis_url = os.getenv("TELEGRAM_SESSION_REDIS_URL")
+    if not redis_url:
+        logger.info("TELEGRAM_SESSION_REDIS_URL is not set, keeping sessions in memory")
+        return InMemorySessionStore()
+
+    return RedisSessionStore(redis_url, int(os.getenv("TELEGRAM_SESSION_TTL", "3600")))
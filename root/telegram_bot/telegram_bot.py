@@ -1,10 +1,24 @@
 import os
-import json
+import heapq
+import pathlib
+import asyncio
 import logging
-
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+import itertools
+from types import MappingProxyType
+from typing import Mapping, Optional
+from operator import attrgetter
+
+import orjson
+from telegram import (
+    Bot,
+    Update,
+    CallbackQuery,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+)
 from telegram.ext import (
     filters,
+    Application,
     ApplicationBuilder,
     ContextTypes,
     CommandHandler,
@@ -12,13 +26,41 @@ from telegram.ext import (
     CallbackQueryHandler,
 )
 
+import utils
 import schemas
 from parsers import WorkUaParser
 from parsers import RobotaUaParser
+from .rate_limiter import ChatRateLimiter
+from .session_store import create_session_store
 
 
 logger = logging.getLogger(__name__)
 
+RATE_LIMIT_MAX_RETRIES = 3
+SEARCH_QUEUE_SIZE = 100
+
+
+def _load_options(json_path_env: str) -> Mapping:
+    """
+    Loads options from the JSON file specified by the given environment variable.
+    Logs an error and returns no options if the file is missing or malformed.
+    """
+    json_file_path = os.getenv(json_path_env)
+    if not json_file_path or not pathlib.Path(json_file_path).is_file():
+        logger.error(f"Options file {json_file_path} set in {json_path_env} not found")
+        return MappingProxyType({})
+
+    try:
+        return utils.load_json_config(json_file_path)
+    except orjson.JSONDecodeError as e:
+        logger.error(f"Failed to parse options from {json_file_path}: {e}")
+        return MappingProxyType({})
+
+
+# Option files are loaded once at import time, handlers only read them from memory
+SALARY_OPTIONS = _load_options("TELEGRAM_SALARY_JSON_PATH")
+EXPERIENCE_OPTIONS = _load_options("TELEGRAM_EXPERIENCE_JSON_PATH")
+
 
 class TelegramBot:
     """
@@ -26,69 +68,72 @@ class TelegramBot:
     Handles interaction with users to set search parameters and perform searches.
     """
 
-    def __init__(self, work_ua_parser: WorkUaParser, robota_ua_parser: RobotaUaParser):
-        """
-        Initializes the TelegramBot with parsers for Work.ua and Robota.ua,
-        sets up the bot application, and loads salary and experience options from JSON files.
+    __slots__ = (
+        "work_ua_parser",
+        "robota_ua_parser",
+        "__application",
+        "__sessions",
+        "__search_queue",
+        "__searching_chats",
+        "__search_workers",
+        "__experience_mapping",
+        "__experience_items",
+        "__salary_from_markup",
+        "__salary_to_markup",
+        "__callback_dispatch",
+    )
+
+    def __init__(
+        self,
+        work_ua_parser: WorkUaParser,
+        robota_ua_parser: RobotaUaParser,
+        session_store=None,
+    ):
+        """
+        Initializes the TelegramBot with parsers for Work.ua and Robota.ua
+        and sets up the bot application.
+        User sessions are kept in the given store, by default one is created from the environment.
         """
         self.work_ua_parser = work_ua_parser
         self.robota_ua_parser = robota_ua_parser
         self.__application = (
-            ApplicationBuilder().token(os.getenv("TELEGRAM_BOT_TOKEN")).build()
+            ApplicationBuilder()
+            .token(os.getenv("TELEGRAM_BOT_TOKEN"))
+            # Keeps outgoing requests under Telegram's global and per-chat flood limits
+            .rate_limiter(ChatRateLimiter(max_retries=RATE_LIMIT_MAX_RETRIES))
+            .post_init(self.__on_startup)
+            .post_shutdown(self.__on_shutdown)
+            .build()
         )
-        self.__user_data = {}
-        self.__load_options()
-
-    def __load_options(self) -> None:
-        """
-        Loads salary and experience options from respective JSON files.
-        Logs errors if files cannot be read or parsed.
-        """
-        self.__load_salary_options()
-        self.__load_experience_options()
-
-    def __load_salary_options(self) -> None:
-        """
-        Loads salary options from the file specified by TELEGRAM_SALARY_JSON_PATH.
-        Logs an error if the file is missing or malformed.
-        """
-        json_file_path = os.getenv("TELEGRAM_SALARY_JSON_PATH")
-        try:
-            with open(json_file_path, "r") as json_file:
-                salary_options = json.load(json_file)
-                self.SALARY_FROM_OPTIONS = salary_options.get("SALARY_FROM_OPTIONS", [])
-                self.SALARY_TO_OPTIONS = salary_options.get("SALARY_TO_OPTIONS", [])
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"Failed to load salary options from {json_file_path}: {e}")
-
-    def __load_experience_options(self) -> None:
-        """
-        Loads experience options from the file specified by TELEGRAM_EXPERIENCE_JSON_PATH.
-        Logs an error if the file is missing or malformed.
-        """
-        json_file_path = os.getenv("TELEGRAM_EXPERIENCE_JSON_PATH")
-        try:
-            with open(json_file_path, "r") as json_file:
-                experience_options = json.load(json_file)
-                self.EXPERIENCE_OPTIONS = experience_options
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"Failed to load experience options from {json_file_path}: {e}")
+        self.__sessions = session_store or create_session_store()
+        self.__search_queue = asyncio.Queue(maxsize=SEARCH_QUEUE_SIZE)
+        # Chats with a queued or running search, each chat may only have one
+        self.__searching_chats = set()
+        self.__search_workers = []
+        self.__experience_mapping = {
+            label: key for key, label in EXPERIENCE_OPTIONS.items()
+        }
+        self.__experience_items = tuple(self.__experience_mapping.items())
+        self.__salary_from_markup = TelegramBot.__build_salary_keyboard(
+            SALARY_OPTIONS.get("SALARY_FROM_OPTIONS", {}), "salary_from"
+        )
+        self.__salary_to_markup = TelegramBot.__build_salary_keyboard(
+            SALARY_OPTIONS.get("SALARY_TO_OPTIONS", {}), "salary_to"
+        )
+        # Callback data prefix -> handler, anything else is an experience option toggle
+        self.__callback_dispatch = {
+            "experience_complete": self.__complete_experience,
+            "experience_reset": self.__reset_experience,
+            "salary_from": self.__set_salary_from,
+            "salary_to": self.__set_salary_to,
+        }
 
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """
         Starts interaction with the user, welcoming them and providing a menu of available commands.
         """
         chat_id = update.effective_chat.id
-        self.__user_data[chat_id] = {
-            "state": schemas.UserState.FREE,
-            "search_options": {
-                "search": "",
-                "region": "",
-                "salary_from": 0,
-                "salary_to": 0,
-                "experience": [],
-            },
-        }
+        await self.__sessions.save(chat_id, schemas.UserSession())
 
         await context.bot.send_message(
             chat_id=chat_id,
@@ -109,7 +154,7 @@ class TelegramBot:
         Stops the bot interaction for the current user and clears their data.
         """
         chat_id = update.effective_chat.id
-        self.__user_data.pop(chat_id, None)
+        await self.__sessions.delete(chat_id)
 
         await context.bot.send_message(
             chat_id=chat_id, text="Goodbye! Hope I was helpful."
@@ -120,21 +165,27 @@ class TelegramBot:
         Clears the user's search parameters and restores them to default values.
         """
         chat_id = update.effective_chat.id
-        self.__user_data[chat_id] = {
-            "state": schemas.UserState.FREE,
-            "search_options": {
-                "search": "",
-                "region": "",
-                "salary_from": "",
-                "salary_to": "",
-                "experience": [],
-            },
-        }
+        await self.__sessions.save(chat_id, schemas.UserSession())
         await context.bot.send_message(
             chat_id=chat_id,
             text="All parameters cleared. You can now provide new parameters.",
         )
 
+    async def __get_session(
+        self, chat_id: int, bot: Bot
+    ) -> Optional[schemas.UserSession]:
+        """
+        Returns the user's session, or asks them to /start when there is none
+        (it was never created or has expired).
+        """
+        session = await self.__sessions.get(chat_id)
+        if not session:
+            await bot.send_message(
+                chat_id=chat_id, text="Please type /start to make a request."
+            )
+
+        return session
+
     async def set_parameter(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
@@ -144,18 +195,23 @@ class TelegramBot:
         """
         chat_id = update.effective_chat.id
         text = update.message.text
+        session = await self.__get_session(chat_id, context.bot)
+        if not session:
+            return
 
         if text.startswith("/keywords"):
             await context.bot.send_message(
                 chat_id=chat_id, text="Please provide your search query."
             )
-            self.__user_data[chat_id]["state"] = schemas.UserState.ASKING_KEYWORDS
+            session.state = schemas.UserState.ASKING_KEYWORDS
 
         elif text.startswith("/region"):
             await context.bot.send_message(
                 chat_id=chat_id, text="Please provide your desired region."
             )
-            self.__user_data[chat_id]["state"] = schemas.UserState.ASKING_REGION
+            session.state = schemas.UserState.ASKING_REGION
+
+        await self.__sessions.save(chat_id, session)
 
     async def accept_parameter(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
@@ -165,38 +221,31 @@ class TelegramBot:
         """
         chat_id = update.effective_chat.id
         text = update.message.text
+        bot = context.bot
 
-        if not self.__user_data.get(chat_id):
-            await context.bot.send_message(
-                chat_id=chat_id, text="Please type /start to make a request."
-            )
+        session = await self.__get_session(chat_id, bot)
+        if not session:
             return
 
-        if self.__user_data[chat_id]["state"] == schemas.UserState.FREE:
-            await context.bot.send_message(
+        state = session.state
+        if state == schemas.UserState.FREE:
+            await bot.send_message(
                 chat_id=chat_id,
                 text="It seems you're not choosing any parameter, type one of the following commands: "
                 "/keywords, /region, /salary, /experience, /search, /clear",
             )
-        elif self.__user_data[chat_id]["state"] == schemas.UserState.ASKING_KEYWORDS:
-            self.__user_data[chat_id]["search_options"]["search"] = text
-            await context.bot.send_message(
-                chat_id=chat_id, text=f"Search query set to: {text}"
-            )
+            return
 
-        elif self.__user_data[chat_id]["state"] == schemas.UserState.ASKING_REGION:
-            self.__user_data[chat_id]["search_options"]["region"] = text
-            await context.bot.send_message(
-                chat_id=chat_id, text=f"Region set to: {text}"
-            )
+        if state == schemas.UserState.ASKING_KEYWORDS:
+            session.search = text
+            await bot.send_message(chat_id=chat_id, text=f"Search query set to: {text}")
 
-        self.__user_data[chat_id]["state"] = schemas.UserState.FREE
+        elif state == schemas.UserState.ASKING_REGION:
+            session.region = text
+            await bot.send_message(chat_id=chat_id, text=f"Region set to: {text}")
 
-    def __get_experience_mapping(self) -> dict:
-        """
-        Maps the experience labels to their corresponding keys.
-        """
-        return {label: key for key, label in self.EXPERIENCE_OPTIONS.items()}
+        session.state = schemas.UserState.FREE
+        await self.__sessions.save(chat_id, session)
 
     def __build_experience_keyboard(
         self, selected_experience: list
@@ -204,15 +253,14 @@ class TelegramBot:
         """
         Builds an inline keyboard for selecting experience levels.
         """
-        experience_mapping = self.__get_experience_mapping()
-
+        selected = set(selected_experience)
         keyboard = [
             [
                 InlineKeyboardButton(
-                    f"✅ {label}" if label in selected_experience else label,
+                    f"✅ {label}" if label in selected else label,
                     callback_data=key,
                 )
-                for key, label in experience_mapping.items()
+                for key, label in self.__experience_items
             ]
         ]
 
@@ -235,11 +283,14 @@ class TelegramBot:
         Handles the user request to set the experience level parameter.
         """
         chat_id = update.effective_chat.id
-        experience = self.__user_data[chat_id]["search_options"]["experience"]
+        session = await self.__get_session(chat_id, context.bot)
+        if not session:
+            return
 
-        reply_markup = self.__build_experience_keyboard(experience)
+        reply_markup = self.__build_experience_keyboard(session.experience)
 
-        self.__user_data[chat_id]["state"] = schemas.UserState.ASKING_EXPERIENCE
+        session.state = schemas.UserState.ASKING_EXPERIENCE
+        await self.__sessions.save(chat_id, session)
 
         await context.bot.send_message(
             chat_id=chat_id,
@@ -247,86 +298,186 @@ class TelegramBot:
             reply_markup=reply_markup,
         )
 
-    async def experience_callback(
+    async def option_callback(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
         """
-        Handles the callback for selecting or deselecting experience options in the user's search query.
+        Handles inline keyboard callbacks for the experience and salary parameters.
+        The callback data prefix (before ":") selects the handler, any other data toggles an experience option.
         """
         query = update.callback_query
         await query.answer()
 
         chat_id = query.message.chat_id
-        user_data = self.__user_data[chat_id]
-        selected_experience = user_data["search_options"].get("experience", [])
+        session = await self.__get_session(chat_id, context.bot)
+        if not session:
+            return
 
-        experience_mapping = self.__get_experience_mapping()
-        action = query.data
+        prefix, _, value = query.data.partition(":")
 
-        if action == "experience_complete":
-            selected_text = (
-                ", ".join(selected_experience) if selected_experience else "None"
-            )
-            user_data["state"] = schemas.UserState.FREE
-            await query.edit_message_text(
-                text=f"Experience selection completed: {selected_text}."
-            )
+        handler = self.__callback_dispatch.get(prefix)
+        if handler is None:
+            await self.__toggle_experience(query, session, prefix)
+        else:
+            await handler(query, session, value)
 
-        elif action == "experience_reset":
-            user_data["search_options"]["experience"] = []
-            await query.edit_message_text(
-                text="Experience options have been reset. Please select again.",
-                reply_markup=self.__build_experience_keyboard(selected_experience),
-            )
+        await self.__sessions.save(chat_id, session)
+
+    async def __complete_experience(
+        self, query: CallbackQuery, session: schemas.UserSession, _: str
+    ) -> None:
+        """
+        Finishes the experience selection and reports the chosen options.
+        """
+        selected_text = ", ".join(session.experience) if session.experience else "None"
+        session.state = schemas.UserState.FREE
+        await query.edit_message_text(
+            text=f"Experience selection completed: {selected_text}."
+        )
+
+    async def __reset_experience(
+        self, query: CallbackQuery, session: schemas.UserSession, _: str
+    ) -> None:
+        """
+        Clears the selected experience options and redraws the keyboard.
+        """
+        session.experience.clear()
+        await query.edit_message_text(
+            text="Experience options have been reset. Please select again.",
+            reply_markup=self.__build_experience_keyboard(session.experience),
+        )
 
+    async def __toggle_experience(
+        self, query: CallbackQuery, session: schemas.UserSession, action: str
+    ) -> None:
+        """
+        Selects or deselects a single experience option and redraws the keyboard.
+        """
+        selected_experience = session.experience
+        selected_option = self.__experience_mapping[action]
+        if selected_option in selected_experience:
+            selected_experience.remove(selected_option)
         else:
-            selected_option = experience_mapping[action]
-            if selected_option in selected_experience:
-                selected_experience.remove(selected_option)
-            else:
-                selected_experience.append(selected_option)
-
-            await query.edit_message_text(
-                text=f"Experience options selected: {', '.join(selected_experience) if selected_experience else 'None'}\n"
-                "You can toggle options, reset, or complete your selection.",
-                reply_markup=self.__build_experience_keyboard(selected_experience),
-            )
+            selected_experience.append(selected_option)
+
+        await query.edit_message_text(
+            text=f"Experience options selected: {', '.join(selected_experience) if selected_experience else 'None'}\n"
+            "You can toggle options, reset, or complete your selection.",
+            reply_markup=self.__build_experience_keyboard(selected_experience),
+        )
 
     async def search_resumes(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
         """
-        Searches resumes based on the user's parameters (keywords, region, salary, experience).
-        Combines results from multiple job websites (Work.ua, Robota.ua), sorts them, and sends
-        the top 5 resumes to the user.
+        Queues a resume search based on the user's parameters (keywords, region, salary, experience).
+        The search itself runs in a background worker, so the update is handled immediately.
         """
         chat_id = update.effective_chat.id
-        search_options = self.__user_data[chat_id]["search_options"]
+        session = await self.__get_session(chat_id, context.bot)
+        if not session:
+            return
 
-        if "search" not in search_options:
+        if not session.search:
             await context.bot.send_message(
                 chat_id=chat_id, text="Please provide at least keywords."
             )
             return
 
-        search_options = schemas.SearchOptions(**search_options)
+        if chat_id in self.__searching_chats:
+            await context.bot.send_message(
+                chat_id=chat_id,
+                text="A search is already running, please wait for its results.",
+            )
+            return
+
+        try:
+            self.__search_queue.put_nowait((chat_id, session.to_search_options()))
+        except asyncio.QueueFull:
+            await context.bot.send_message(
+                chat_id=chat_id,
+                text="Too many searches are running right now, please try again later.",
+            )
+            return
+
+        self.__searching_chats.add(chat_id)
+        await context.bot.send_message(
+            chat_id=chat_id,
+            text="Searching for resumes, I'll send you the results when they're ready.",
+        )
+
+    async def __search_worker(self) -> None:
+        """
+        Takes queued searches one by one and runs them until the worker is cancelled.
+        """
+        while True:
+            chat_id, search_options = await self.__search_queue.get()
+            try:
+                await self.__run_search(chat_id, search_options)
+            except Exception as e:
+                logger.error(f"Resume search for chat {chat_id} failed: {e}")
+                await self.__notify_search_failed(chat_id)
+            finally:
+                self.__searching_chats.discard(chat_id)
+                self.__search_queue.task_done()
+
+    async def __notify_search_failed(self, chat_id: int) -> None:
+        """
+        Tells the user their search failed. Errors are only logged, so the worker keeps running.
+        """
+        try:
+            await self.__application.bot.send_message(
+                chat_id=chat_id,
+                text="Something went wrong while searching, please try again later.",
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to notify chat {chat_id} about the failed search: {e}"
+            )
 
-        # Fetch resumes from both sources
-        work_ua_results = self.work_ua_parser.search_resumes(search_options.copy())
-        robota_ua_results = self.robota_ua_parser.search_resumes(search_options.copy())
+    async def __run_search(
+        self, chat_id: int, search_options: schemas.SearchOptions
+    ) -> None:
+        """
+        Combines results from multiple job websites (Work.ua, Robota.ua), sorts them, and sends
+        the top 5 resumes to the user.
+        """
+        # Fetch resumes from both sources concurrently, Robota.ua parser is blocking
+        work_ua_results, robota_ua_results = await asyncio.gather(
+            self.work_ua_parser.search_resumes(search_options),
+            asyncio.to_thread(self.robota_ua_parser.search_resumes, search_options),
+        )
 
-        # Combine and sort results
-        combined_results = sorted(work_ua_results + robota_ua_results, reverse=True)
-        top_resumes = combined_results[:5]
+        # Pick the top 5 results without sorting all of them
+        total_resumes = len(work_ua_results) + len(robota_ua_results)
+        top_resumes = heapq.nlargest(
+            5,
+            itertools.chain(work_ua_results, robota_ua_results),
+            key=attrgetter("filling_percentage"),
+        )
 
         # Send the top 5 resumes
-        await context.bot.send_message(
+        await self.__application.bot.send_message(
             chat_id=chat_id,
-            text=f"Found {len(combined_results)} resumes\n"
+            text=f"Found {total_resumes} resumes\n"
             f"You can see top 5 below:\n"
-            f"{'\n'.join([TelegramBot.format_resume(resume) for resume in top_resumes])}",
+            f"{'\n'.join(TelegramBot.format_resume(resume) for resume in top_resumes)}",
         )
 
+    @staticmethod
+    def __build_salary_keyboard(
+        salary_options: Mapping, callback_prefix: str
+    ) -> InlineKeyboardMarkup:
+        """
+        Builds an inline keyboard with one salary option per row.
+        """
+        keyboard = [
+            [InlineKeyboardButton(label, callback_data=f"{callback_prefix}:{value}")]
+            for label, value in salary_options.items()
+        ]
+
+        return InlineKeyboardMarkup(keyboard)
+
     async def salary(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """
         Initiates the salary parameter selection by sending an inline keyboard with salary options.
@@ -337,83 +488,85 @@ class TelegramBot:
             context (ContextTypes.DEFAULT_TYPE): The context for the bot interaction.
         """
         chat_id = update.effective_chat.id
-        self.__user_data[chat_id]["state"] = schemas.UserState.ASKING_SALARY_FROM
-
-        keyboard = [
-            [InlineKeyboardButton(label, callback_data=f"salary_from:{value}")]
-            for label, value in self.SALARY_FROM_OPTIONS.items()
-        ]
+        session = await self.__get_session(chat_id, context.bot)
+        if not session:
+            return
 
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        session.state = schemas.UserState.ASKING_SALARY_FROM
+        await self.__sessions.save(chat_id, session)
 
         await context.bot.send_message(
             chat_id=chat_id,
             text="Select the minimum salary:",
-            reply_markup=reply_markup,
+            reply_markup=self.__salary_from_markup,
         )
 
-    async def salary_callback(
-        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    async def __set_salary_from(
+        self, query: CallbackQuery, session: schemas.UserSession, value: str
     ) -> None:
         """
-        Handles the callback for selecting the minimum or maximum salary in the user's search query.
-        The user selects either the minimum or maximum salary, and the bot updates the salary parameters.
-
-        Args:
-            update (Update): The incoming callback query containing information about the user's choice.
-            context (ContextTypes.DEFAULT_TYPE): The context for the bot interaction.
+        Stores the selected minimum salary and asks for the maximum one.
         """
-        query = update.callback_query
-        await query.answer()
-
-        chat_id = query.message.chat_id
-        data = query.data
-
-        if data.startswith("salary_from:"):
-            self.__user_data[chat_id]["search_options"]["salary_from"] = int(
-                data.split(":")[1]
-            )
-            self.__user_data[chat_id]["state"] = schemas.UserState.ASKING_SALARY_TO
+        session.salary_from = int(value)
+        session.state = schemas.UserState.ASKING_SALARY_TO
 
-            keyboard = [
-                [InlineKeyboardButton(label, callback_data=f"salary_to:{value}")]
-                for label, value in self.SALARY_TO_OPTIONS.items()
-            ]
-
-            reply_markup = InlineKeyboardMarkup(keyboard)
-
-            await query.edit_message_text(
-                text="Select the maximum salary:", reply_markup=reply_markup
-            )
+        await query.edit_message_text(
+            text="Select the maximum salary:",
+            reply_markup=self.__salary_to_markup,
+        )
 
-        elif data.startswith("salary_to:"):
-            self.__user_data[chat_id]["search_options"]["salary_to"] = int(
-                data.split(":")[1]
-            )
-            self.__user_data[chat_id]["state"] = schemas.UserState.FREE
+    async def __set_salary_to(
+        self, query: CallbackQuery, session: schemas.UserSession, value: str
+    ) -> None:
+        """
+        Stores the selected maximum salary and finishes the salary selection.
+        """
+        session.salary_to = int(value)
+        session.state = schemas.UserState.FREE
 
-            await query.edit_message_text(text="Salary range set successfully.")
+        await query.edit_message_text(text="Salary range set successfully.")
 
     @staticmethod
     def format_resume(resume: schemas.Resume) -> str:
         """
         Formats a resume object into a human-readable string.
         """
-        formatted_resume = f"Resume: {resume.href}\n"
+        parts = [f"Resume: {resume.href}\n"]
 
         if resume.salary_expectation:
-            formatted_resume += f"Salary expectation: {resume.salary_expectation}\n"
+            parts.append(f"Salary expectation: {resume.salary_expectation}\n")
 
         if resume.experience:
-            formatted_resume += "Experience/Education:\n"
+            parts.append("Experience/Education:\n")
             for exp in resume.experience:
-                formatted_resume += f"    Position: {exp.position or 'N/A'}\n"
-                formatted_resume += f"    Duration: {exp.duration or 'N/A'}\n"
-                formatted_resume += f"    Details: {exp.details or 'N/A'}\n\n"
+                parts.append(f"    Position: {exp.position or 'N/A'}\n")
+                parts.append(f"    Duration: {exp.duration or 'N/A'}\n")
+                parts.append(f"    Details: {exp.details or 'N/A'}\n\n")
+
+        parts.append(f"Resume filling percentage: {resume.filling_percentage}%\n")
+
+        return "".join(parts)
+
+    async def __on_startup(self, application: Application) -> None:
+        """
+        Starts the background workers that run queued resume searches.
+        """
+        workers_count = int(os.getenv("TELEGRAM_SEARCH_WORKERS", "4"))
+        self.__search_workers = [
+            asyncio.create_task(self.__search_worker()) for _ in range(workers_count)
+        ]
 
-        formatted_resume += f"Resume filling percentage: {resume.filling_percentage}%\n"
+    async def __on_shutdown(self, application: Application) -> None:
+        """
+        Stops the search workers and releases the session store and parser resources.
+        """
+        for worker in self.__search_workers:
+            worker.cancel()
+        await asyncio.gather(*self.__search_workers, return_exceptions=True)
 
-        return formatted_resume
+        await self.__sessions.close()
+        await self.work_ua_parser.close()
+        self.robota_ua_parser.close()
 
     def __add_handlers(self):
         start_handler = CommandHandler("start", self.start)
@@ -422,13 +575,10 @@ class TelegramBot:
         set_param_handler = CommandHandler(["keywords", "region"], self.set_parameter)
 
         experience_handler = CommandHandler("experience", self.experience)
-        experience_callback_handler = CallbackQueryHandler(
-            self.experience_callback, pattern="^experience_"
-        )
 
         salary_handler = CommandHandler("salary", self.salary)
-        salary_callback_handler = CallbackQueryHandler(
-            self.salary_callback, pattern="^salary_(from|to):"
+        option_callback_handler = CallbackQueryHandler(
+            self.option_callback, pattern="^(experience_|salary_(from|to):)"
         )
 
         search_handler = CommandHandler("search", self.search_resumes)
@@ -442,9 +592,8 @@ class TelegramBot:
             clear_handler,
             set_param_handler,
             experience_handler,
-            experience_callback_handler,
             salary_handler,
-            salary_callback_handler,
+            option_callback_handler,
             search_handler,
             accept_parameter_handler,
         ]
@@ -455,6 +604,21 @@ class TelegramBot:
     def run(self):
         """
         Starts the bot and sets up all the necessary command and callback handlers for user interactions.
+        Receives updates through a webhook when TELEGRAM_WEBHOOK_URL is set, otherwise by long polling.
         """
         self.__add_handlers()
-        self.__application.run_polling()
+
+        webhook_url = os.getenv("TELEGRAM_WEBHOOK_URL")
+        if not webhook_url:
+            self.__application.run_polling()
+            return
+
+        # Telegram pushes updates to <webhook_url>/<secret> and signs them with the same secret
+        webhook_secret = os.getenv("TELEGRAM_WEBHOOK_SECRET", "")
+        self.__application.run_webhook(
+            listen="0.0.0.0",
+            port=int(os.getenv("TELEGRAM_WEBHOOK_PORT", "8443")),
+            url_path=webhook_secret,
+            secret_token=webhook_secret or None,
+            webhook_url=f"{webhook_url.rstrip('/')}/{webhook_secret}",
+        )
@@ -1,3 +1,15 @@
-from .helper import preview_html, wrap_with_scraper_api, get_most_similar_word
+from .helper import (
+    preview_html,
+    wrap_with_scraper_api,
+    get_most_similar_word,
+    disk_memoize,
+    load_json_config,
+)
 
-__all__ = ["preview_html", "wrap_with_scraper_api", "get_most_similar_word"]
+__all__ = [
+    "preview_html",
+    "wrap_with_scraper_api",
+    "get_most_similar_word",
+    "disk_memoize",
+    "load_json_config",
+]
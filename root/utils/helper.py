@@ -1,54 +1,174 @@
 import os
+import gzip
+import pathlib
+import time
+import asyncio
+import hashlib
+import inspect
 import logging
 import tempfile
+import functools
+from types import MappingProxyType
+from urllib.parse import quote
+from collections import OrderedDict
 from rapidfuzz import process, fuzz
 
+import orjson
+
 import webbrowser
 
 
 logger = logging.getLogger(__name__)
 
+PRUNE_EVERY_WRITES = 100
+SCRAPER_API_KEY = os.getenv("SCRAPER_API_KEY")
+SCRAPER_API_BASE_URL = f"https://api.scraperapi.com?api_key={SCRAPER_API_KEY}&url="
+WORD_SIMILARITY_THRESHOLD = int(os.environ["WORD_SIMILARITY_THRESHOLD"])
+PREVIEW_HTML_PATH = os.path.join(tempfile.gettempdir(), "resume_parser_preview.html")
+
 
 def wrap_with_scraper_api(url):
     """
     Builds a URL with the ScraperAPI endpoint and required query parameters.
+    The target URL is percent-encoded so its own query string survives intact.
+    """
+    return SCRAPER_API_BASE_URL + quote(url, safe="")
+
+
+@functools.lru_cache(maxsize=None)
+def load_json_config(path):
+    """
+    Reads and parses a JSON configuration file once per path and returns a read-only mapping.
+    Call load_json_config.cache_clear() to pick up changes made to the files.
     """
-    return f'http://api.scraperapi.com?api_key={os.getenv("SCRAPER_API_KEY")}&url={url}'
+    return MappingProxyType(orjson.loads(pathlib.Path(path).read_bytes()))
 
 
+@functools.lru_cache(maxsize=4096)
 def get_most_similar_word(word, vocabulary):
     """
     Finds the most similar word from a given vocabulary based on a similarity threshold.
+    The vocabulary must be hashable (e.g. a tuple), results are cached per word and vocabulary.
     """
     matched_region = process.extractOne(word, vocabulary, scorer=fuzz.token_sort_ratio)
 
-    if matched_region and matched_region[1] > int(
-        os.getenv("WORD_SIMILARITY_THRESHOLD")
-    ):
+    if matched_region and matched_region[1] > WORD_SIMILARITY_THRESHOLD:
         return matched_region[0]
 
 
 def preview_html(response_text):
     """
     Saves the provided HTML content to a temporary file and opens it in the default web browser.
+    The same file is overwritten on every call.
     """
     try:
-        temp_dir = tempfile.mkdtemp()
-    except OSError as e:
-        logger.info(f"Failed to create temporary directory: {e}")
-        return
-
-    try:
-        temp_file_path = os.path.join(temp_dir, "page.html")
-
-        with open(temp_file_path, "w", encoding="utf-8") as file:
-            file.write(response_text)
+        with open(PREVIEW_HTML_PATH, "wb") as file:
+            file.write(response_text.encode("utf-8"))
     except (OSError, IOError) as e:
         logger.info(f"Failed to write to the temporary file: {e}")
         return
 
     try:
-        webbrowser.open(f"file://{temp_file_path}")
-        logger.info(f"HTML file saved to {temp_file_path} and opened in browser.")
+        webbrowser.open(f"file://{PREVIEW_HTML_PATH}")
+        logger.info(f"HTML file saved to {PREVIEW_HTML_PATH} and opened in browser.")
     except webbrowser.Error as e:
         logger.info(f"Failed to open the file in the web browser: {e}")
+
+
+def _read_cache_file(cache_path, ttl):
+    """
+    Reads a gzipped cache file, returning its write time and content,
+    or None if the file is missing or older than ttl seconds.
+    """
+    try:
+        written_at = os.path.getmtime(cache_path)
+        if time.time() - written_at > ttl:
+            return None
+        with open(cache_path, "rb") as cache_file:
+            return written_at, gzip.decompress(cache_file.read()).decode("utf-8")
+    except (OSError, EOFError, UnicodeDecodeError):
+        return None
+
+
+def _write_cache_file(cache_dir, cache_path, content):
+    """
+    Writes the content to a gzipped cache file. The file is written under a temporary
+    name and renamed, so concurrent readers never see a partially written entry.
+    """
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as cache_file:
+            cache_file.write(gzip.compress(content.encode("utf-8")))
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        logger.info(f"Failed to write cache file {cache_path}: {e}")
+
+
+def _prune_cache_dir(cache_dir, max_entries):
+    """
+    Removes the oldest cache files until at most max_entries are left.
+    """
+    try:
+        entries = sorted(os.scandir(cache_dir), key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[: max(len(entries) - max_entries, 0)]:
+            os.remove(entry.path)
+    except OSError as e:
+        logger.info(f"Failed to prune cache directory {cache_dir}: {e}")
+
+
+def disk_memoize(cache_dir, ttl, max_entries, memory_entries=2048):
+    """
+    Memoizes an async function by its `url` argument, in memory and in gzipped files
+    under cache_dir. Entries expire ttl seconds after they were fetched, and the oldest
+    files are removed once there are more than max_entries of them.
+    Without a cache_dir only the in-memory cache is used.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        memory_cache = OrderedDict()
+        writes = 0
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            nonlocal writes
+            url = signature.bind(*args, **kwargs).arguments["url"]
+
+            cached = memory_cache.get(url)
+            if cached and time.time() - cached[0] <= ttl:
+                memory_cache.move_to_end(url)
+                return cached[1]
+
+            cached = None
+            if cache_dir:
+                cache_path = os.path.join(
+                    cache_dir,
+                    f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.html.gz",
+                )
+                cached = await asyncio.to_thread(_read_cache_file, cache_path, ttl)
+
+            if not cached:
+                content = await func(*args, **kwargs)
+                cached = time.time(), content
+
+                if cache_dir:
+                    await asyncio.to_thread(
+                        _write_cache_file, cache_dir, cache_path, content
+                    )
+
+                    writes += 1
+                    if writes % PRUNE_EVERY_WRITES == 0:
+                        await asyncio.to_thread(
+                            _prune_cache_dir, cache_dir, max_entries
+                        )
+
+            memory_cache[url] = cached
+            if len(memory_cache) > memory_entries:
+                memory_cache.popitem(last=False)
+
+            return cached[1]
+
+        return wrapper
+
+    return decorator